@@ -0,0 +1,56 @@
+"""address unique constraint
+
+Revision ID: 8d3f1c2a7b45
+Revises: 2154f34bf0b1
+Create Date: 2026-10-15 09:12:41.208311
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "8d3f1c2a7b45"
+down_revision = "2154f34bf0b1"
+branch_labels = None
+depends_on = None
+
+
+# earlier code let one user save the same street/city/state more than once;
+# every such group keeps its oldest row and orders are pointed at it. Rows
+# with a NULL in the key are left alone, the constraint allows them anyway
+duplicate_addresses = """
+    WITH ranked AS (
+        SELECT id, FIRST_VALUE(id) OVER (
+            PARTITION BY user_id, street, city, state ORDER BY created_at, id
+        ) AS keep_id
+        FROM address
+        WHERE user_id IS NOT NULL AND street IS NOT NULL
+            AND city IS NOT NULL AND state IS NOT NULL
+    )
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        duplicate_addresses
+        + """
+        UPDATE "order" SET shipping_address_id = (
+            SELECT keep_id FROM ranked WHERE ranked.id = "order".shipping_address_id
+        )
+        WHERE shipping_address_id IN (SELECT id FROM ranked WHERE id != keep_id)
+        """
+    )
+    op.execute(
+        duplicate_addresses
+        + "DELETE FROM address WHERE id IN (SELECT id FROM ranked WHERE id != keep_id)"
+    )
+    with op.batch_alter_table("address") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_address_user_street_city_state",
+            ["user_id", "street", "city", "state"],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("address") as batch_op:
+        batch_op.drop_constraint("uq_address_user_street_city_state", type_="unique")
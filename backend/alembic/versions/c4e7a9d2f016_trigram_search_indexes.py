@@ -0,0 +1,58 @@
+"""trigram search indexes
+
+Revision ID: c4e7a9d2f016
+Revises: 8d3f1c2a7b45
+Create Date: 2026-10-15 11:40:03.517264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4e7a9d2f016"
+down_revision = "8d3f1c2a7b45"
+branch_labels = None
+depends_on = None
+
+# text columns searched with `ILIKE '%...%'` by BaseRepository.filter, i.e.
+# BaseRepository._text_columns() of every model served by a filter endpoint;
+# every column of a table needs an index for postgres to use them in the OR
+searchable_columns = {
+    "address": ["street", "city", "state", "postal_code"],
+    "author": ["firstname", "lastname", "email", "short_description", "full_description"],
+    "category": ["name"],
+    "media": ["name", "alt", "url", "content_type"],
+    "order": ["order_id"],
+    "order_tracking": ["location"],
+    "payments": ["reference"],
+    "permission": ["name"],
+    "product": ["name", "description", "slug", "amazon_link", "epub_link", "kindle_link"],
+    "review": ["comment"],
+    "status": ["name"],
+    "user": ["firstname", "lastname", "email", "tel"],
+    "user_title": ["name"],
+}
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for table, columns in searchable_columns.items():
+        for column in columns:
+            op.create_index(
+                f"idx_{table}_{column}_trgm",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, columns in searchable_columns.items():
+        for column in columns:
+            op.drop_index(f"idx_{table}_{column}_trgm", table_name=table)
@@ -1,8 +1,15 @@
 import uvicorn
+from core.settings import config
 
 
 def run_server():
-    uvicorn.run("main:app", reload=True)
+    uvicorn.run(
+        "main:app",
+        reload=config.debug,
+        loop="auto",
+        http="auto",
+        workers=1 if config.debug else config.workers,
+    )
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import os
 import datetime
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 import pydantic as pyd
 from src.lib.utils import get_path
@@ -31,6 +31,14 @@ class Settings(pyd.BaseSettings):
     db_port: int = os.getenv("DB_PORT")
     db_host: str = os.getenv("DB_HOST")
     db_type: str = os.getenv("DB_TYPE")
+    # connections shared by all worker processes, keep it below the server's
+    # max_connections; each worker's pool gets an equal share, but never less
+    # than db_min_pool_size: every module-level repository keeps its own
+    # session, which holds on to a pooled connection once it has been used
+    db_max_connections: int = os.getenv("DB_MAX_CONNECTIONS", 90)
+    db_min_pool_size: int = os.getenv("DB_MIN_POOL_SIZE", 20)
+    db_max_overflow: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    workers: int = os.getenv("WORKERS", os.cpu_count() or 1)
     # JSON web token settings
     secret_key: str = os.getenv("SECRET_KEY")
     refresh_secret_key: str = os.getenv("REFRESH_SECRET_KEY")
@@ -40,6 +48,8 @@ class Settings(pyd.BaseSettings):
     # payment service settings
     payment_secret_key: str = os.getenv("PAYMENT_SECRET_KEY")
     payment_public_key: str = os.getenv("PAYMENT_PUBLIC_KEY")
+    # cache settings, caching is disabled when unset
+    redis_url: Optional[str] = os.getenv("REDIS_URL")
     # project template, static files path settings
     base_dir: pyd.DirectoryPath = get_path.get_base_dir()
     media_url_endpoint_name = "get_media"
@@ -56,6 +66,9 @@ class Settings(pyd.BaseSettings):
     ):
         return datetime.timedelta(seconds=self.refresh_token_expire_time)
 
+    def get_db_pool_size(self) -> int:
+        return max(self.db_min_pool_size, self.db_max_connections // self.workers)
+
     def get_database_url(self) -> str:
         if self.environment in [
             "production",
@@ -2,10 +2,10 @@ from core.settings import config
 from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
+    async_sessionmaker,
     AsyncSession,
 )
 
-from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base
 
 metadata = MetaData()
@@ -20,8 +20,16 @@ if str(config.get_database_url()).startswith("sqlite+aiosqlite"):
         connect_args={"check_same_thread": False},
     )
 else:
-    engine = create_async_engine(config.get_database_url(), echo=False, future=True)
+    engine = create_async_engine(
+        config.get_database_url(),
+        echo=False,
+        future=True,
+        pool_size=config.get_db_pool_size(),
+        max_overflow=config.db_max_overflow,
+        pool_pre_ping=True,
+        insertmanyvalues_page_size=500,
+    )
 
-async_session: AsyncSession = sessionmaker(
-    bind=engine, expire_on_commit=False, class_=AsyncSession
+async_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    bind=engine, expire_on_commit=False
 )
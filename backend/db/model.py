@@ -16,7 +16,7 @@ class GUID(TypeDecorator):
 
     def load_dialect_impl(self, dialect):
         if dialect.name == "postgresql":
-            return dialect.type_descriptor(UUID())
+            return dialect.type_descriptor(UUID(as_uuid=True))
         else:
             return dialect.type_descriptor(CHAR(32))
 
@@ -24,7 +24,8 @@ class GUID(TypeDecorator):
         if value is None:
             return value
         elif dialect.name == "postgresql":
-            return str(value)
+            # hand the driver a native uuid so the server does not cast text
+            return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
         else:
             if not isinstance(value, uuid.UUID):
                 return "%.32x" % uuid.UUID(value).int
@@ -47,7 +48,7 @@ class Base(Model):
     id = sa.Column(
         GUID(),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
     created_at = sa.Column(
         sa.DateTime,
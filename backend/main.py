@@ -1,11 +1,16 @@
+import sqlalchemy as sa
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from core.settings import config
+from db.config import engine
 from middleware.exclude_data_from_response import exclude_keys_middleware
 from middleware.response_formatter import response_data_transformer
 from middleware.auth_middleware import user_auth_middleware
 from src.base.router import v1, admin_v1
 from src.base.schema.response import HealthCheck
+from src.lib.shared import cache
+from src.lib.utils.payments import flutterwave_client
 
 
 def get_application():
@@ -20,6 +25,7 @@ def get_application():
         },
         docs_url=f"/{config.api_prefix}/v{int(config.project_version)}/docs",
         debug=config.debug,
+        default_response_class=ORJSONResponse,
     )
 
     _app.add_middleware(
@@ -39,6 +45,29 @@ def get_application():
 app = get_application()
 
 
+@app.on_event("startup")
+async def open_database_pool():
+    # run the dialect's first-connect setup before traffic arrives so that
+    # concurrent cold requests do not all race to initialise the pool
+    async with engine.connect() as connection:
+        await connection.execute(sa.text("SELECT 1"))
+
+
+@app.on_event("shutdown")
+async def close_database_pool():
+    await engine.dispose()
+
+
+@app.on_event("shutdown")
+async def close_payment_client():
+    await flutterwave_client.aclose()
+
+
+@app.on_event("shutdown")
+async def close_cache_client():
+    await cache.close()
+
+
 @app.get("/", response_model=HealthCheck, tags=["Health status"])
 def health_check():
     return HealthCheck(
@@ -4,6 +4,11 @@ from sqlalchemy.orm import relationship
 
 class Address(Base):
     __tablename__ = "address"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "user_id", "street", "city", "state", name="uq_address_user_street_city_state"
+        ),
+    )
     user_id = sa.Column(GUID, sa.ForeignKey("user.id", ondelete="CASCADE"))
     user = relationship("User", foreign_keys=[user_id])
     street = sa.Column(sa.String(100))
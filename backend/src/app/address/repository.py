@@ -1,10 +1,57 @@
+import typing as t
+from uuid import UUID
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+from src.lib.errors import error
 from src.base.repository.base_repository import BaseRepository
-from src.app.address import model
+from src.app.address import model, schema
 
 
 class AddressRepository(BaseRepository[model.Address]):
     def __init__(self):
         super().__init__(model.Address)
 
+    async def create_user_address(
+        self,
+        user_id: UUID,
+        obj: schema.IAddressIn,
+    ) -> t.Optional[model.Address]:
+        # the unique constraint on (user_id, street, city, state) decides whether
+        # the address is new; nothing is returned when it already exists
+        insert = postgresql.insert if self.db.bind.dialect.name == "postgresql" else sqlite.insert
+        stmt = (
+            insert(self.model)
+            .values(user_id=user_id, **obj.dict())
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        address = result.scalar_one_or_none()
+        self._detach(address)
+        return address
+
+    async def update_user_address(
+        self,
+        address_id: UUID,
+        user_id: UUID,
+        obj: schema.IAddressIn,
+    ) -> t.Optional[model.Address]:
+        stmt = (
+            sa.update(self.model)
+            .where(self.model.id == address_id, self.model.user_id == user_id)
+            .values(obj.dict())
+            .returning(self.model)
+        )
+        try:
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+        except sa.exc.IntegrityError:
+            await self.db.rollback()
+            raise error.DuplicateError("address already exists")
+        address = result.scalar_one_or_none()
+        self._detach(address)
+        return address
+
 
 address_repo = AddressRepository()
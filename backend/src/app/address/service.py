@@ -3,28 +3,31 @@ import typing as t
 from fastapi import status, Response
 from src.app.user.model import User
 from src.lib.errors import error
+from src.lib.shared import cache
 from src.app.address import schema, model
 from src.app.address.repository import address_repo
 
 
+def _cache_namespace(user: User) -> str:
+    return f"addr:{user.id}"
+
+
 async def create(
     data_in: schema.IAddressIn,
     user: User,
 ) -> model.Address:
-    check_address = await address_repo.get_by_attr(
-        attr=dict(**data_in.dict(), user=user), first=True
-    )
-
-    if check_address:
+    new_address = await address_repo.create_user_address(user_id=user.id, obj=data_in)
+    if new_address is None:
         raise error.DuplicateError("address already exists")
-    new_address = await address_repo.create(dict(**data_in.dict(), user=user))
+    await cache.invalidate(_cache_namespace(user))
     return new_address
 
 
+@cache.cached(key=lambda address_id, user: (_cache_namespace(user), f"get:{address_id}"))
 async def get(
     address_id: uuid.UUID,
     user: User,
-) -> model.Address:
+) -> dict:
     get_address = await address_repo.get_by_attr(attr=dict(id=address_id, user=user), first=True)
     if not get_address:
         raise error.NotFoundError("Address not found")
@@ -36,30 +39,25 @@ async def update(
     data_in: schema.IAddressIn,
     user: User,
 ) -> model.Address:
-    check_if_exist = await address_repo.get_by_attr(
-        attr=dict(
-            id=address_id,
-            user=user,
-            **{k: v for k, v in data_in.dict(exclude_defaults=True).items() if v is not None},
-        ),
-        first=True,
+    result = await address_repo.update_user_address(
+        address_id=address_id, user_id=user.id, obj=data_in
     )
-    if check_if_exist is not None:
-        raise error.DuplicateError("address already exists")
-    get_address = await address_repo.get_by_attr(attr=dict(id=address_id, user=user), first=True)
-    if not get_address:
+    if result is None:
         raise error.NotFoundError("Address not found")
-    result = await address_repo.update(id=address_id, obj=data_in)
+    await cache.invalidate(_cache_namespace(user))
     return result
 
 
+@cache.cached(
+    key=lambda user, **params: (_cache_namespace(user), f"filter:{sorted(params.items())}")
+)
 async def filter(
     user: User,
     filter: str = "",
     per_page: int = 10,
     page: int = 0,
     select: str = "",
-) -> t.List[model.Address]:
+) -> t.List[dict]:
     get_address = await address_repo.filter(
         filter_string=filter,
         per_page=per_page,
@@ -84,4 +82,5 @@ async def delete(
     if not get_address:
         raise error.NotFoundError("Address not found")
     await address_repo.delete(address_id)
+    await cache.invalidate(_cache_namespace(user))
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,17 @@
+import pytest_asyncio
+from fakeredis import aioredis
+from src.lib.shared import cache
+from src.app.user.repository import user_repo
+
+
+@pytest_asyncio.fixture
+async def redis_client(monkeypatch):
+    client = aioredis.FakeRedis()
+    monkeypatch.setattr(cache, "redis_client", client)
+    yield client
+    await client.close()
+
+
+@pytest_asyncio.fixture
+async def user(db_tables):
+    return (await user_repo.create_many([dict(email="reader@iwuji.com", firstname="reader")]))[0]
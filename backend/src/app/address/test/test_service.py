@@ -0,0 +1,58 @@
+import uuid
+import pytest
+from src.lib.errors import error
+from src.app.address import schema, service
+
+pytestmark = pytest.mark.usefixtures("db_tables")
+
+address_in = schema.IAddressIn(street="1 Marina", city="Lagos", state="Lagos", postal_code="101001")
+other_address_in = schema.IAddressIn(
+    street="2 Allen", city="Ikeja", state="Lagos", postal_code="100271"
+)
+
+
+@pytest.mark.asyncio
+async def test_create_duplicate_address(user):
+    await service.create(address_in, user=user)
+    with pytest.raises(error.DuplicateError):
+        await service.create(address_in, user=user)
+
+
+@pytest.mark.asyncio
+async def test_update_address_to_duplicate(user):
+    await service.create(address_in, user=user)
+    other = await service.create(other_address_in, user=user)
+    with pytest.raises(error.DuplicateError):
+        await service.update(other.id, address_in, user=user)
+
+
+@pytest.mark.asyncio
+async def test_get_missing_address(user):
+    with pytest.raises(error.NotFoundError):
+        await service.get(uuid.uuid4(), user=user)
+    with pytest.raises(error.NotFoundError):
+        await service.update(uuid.uuid4(), address_in, user=user)
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_addresses(user, redis_client):
+    namespace = service._cache_namespace(user)
+    address = await service.create(address_in, user=user)
+
+    cached = await service.get(address.id, user=user)
+    assert await redis_client.hget(namespace, f"get:{address.id}") is not None
+    assert await service.get(address.id, user=user) == cached
+    assert cached["id"] == str(address.id)
+
+    await service.create(other_address_in, user=user)
+    assert not await redis_client.exists(namespace)
+
+    await service.get(address.id, user=user)
+    await service.update(address.id, address_in.copy(update=dict(city="Lekki")), user=user)
+    assert not await redis_client.exists(namespace)
+    assert (await service.get(address.id, user=user))["city"] == "Lekki"
+
+    await service.delete(address.id, user=user)
+    assert not await redis_client.exists(namespace)
+    with pytest.raises(error.NotFoundError):
+        await service.get(address.id, user=user)
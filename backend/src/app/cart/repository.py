@@ -21,10 +21,8 @@ class CartRepository(BaseRepository[model.Cart]):
         cart_ids: t.Optional[t.List[UUID]] = None,
     ) -> t.Optional[t.List[model.Cart]]:
         if cart_ids is not None:
-            stm = (
-                sa.select(self.model)
-                .options(sa.orm.selectinload("*"))
-                .where(self.model.id.in_(cart_ids), self.model.user == user)
+            stm = sa.select(self.model).where(
+                self.model.id.in_(cart_ids), self.model.user == user
             )
             result = await self.db.execute(stm)
             return result.scalars().all()
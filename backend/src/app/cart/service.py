@@ -11,7 +11,7 @@ from src.app.cart import validate
 
 
 async def create(data_in: schema.ICartIn, user: User) -> model.Cart:
-    product = await product_repo.get(id=data_in.product_id, load_related=True)
+    product = await product_repo.get(id=data_in.product_id, loads=("property",))
     await validate.validate_cart_data_on_create(data_in, product)
     new_cart = await cart_repo.create(obj=data_in, user=user, product=product)
     if not new_cart:
@@ -28,7 +28,7 @@ async def update(data_in: schema.ICartIn, user: User, cart_id: uuid.UUID) -> mod
     cart = await cart_repo.get_by_attr(
         attr=dict(user_id=user.id, id=cart_id, item_id=data_in.product_id),
         first=True,
-        load_related=True,
+        loads=("item.property",),
     )
     if not cart:
         raise error.NotFoundError("Cart not found")
@@ -0,0 +1,26 @@
+import pytest
+from src.app.cart import schema, service
+from src.app.product.repository import product_repo, product_property_repo
+from src.app.user.repository import user_repo
+
+pytestmark = pytest.mark.usefixtures("db_tables")
+
+
+@pytest.mark.asyncio
+async def test_create_cart_with_eager_loaded_product():
+    user = (await user_repo.create_many([dict(email="reader@iwuji.com", firstname="reader")]))[0]
+    property = await product_property_repo.create(
+        dict(hard_back_qty=5, paper_back_qty=5, has_pdf=True)
+    )
+    product = await product_repo.create(dict(name="book", is_active=True, property=property))
+
+    new_cart = await service.create(
+        schema.ICartIn(product_id=product.id, hard_back_qty=1, paper_back_qty=2),
+        user=user,
+    )
+
+    assert new_cart.item_id == product.id
+    assert new_cart.hard_back_qty == 1
+    updated_property = await product_property_repo.get(property.id)
+    assert updated_property.hard_back_qty == 4
+    assert updated_property.paper_back_qty == 3
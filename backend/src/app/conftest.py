@@ -0,0 +1,32 @@
+import sys
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from db import config as db_config
+from src.base.model.models import model_for_alembic  # noqa
+from src.base.repository.base_repository import BaseRepository
+
+
+def _repositories():
+    for name, module in list(sys.modules.items()):
+        if name.startswith("src.app.") and name.endswith(".repository"):
+            yield from (obj for obj in vars(module).values() if isinstance(obj, BaseRepository))
+
+
+@pytest_asyncio.fixture
+async def db_tables(tmp_path):
+    # every test gets a fresh throwaway database, the tracked testing.sqlite is
+    # never opened
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'test.sqlite'}",
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(db_config.metadata.create_all)
+    db_config.async_session.configure(bind=engine)
+    yield engine
+    # repositories are module-level singletons, so their sessions must not
+    # outlive this test's engine and event loop
+    for repo in _repositories():
+        await repo.__aexit__(None, None, None)
+    db_config.async_session.configure(bind=db_config.engine)
+    await engine.dispose()
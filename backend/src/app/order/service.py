@@ -81,7 +81,7 @@ async def update_order_item_status(
     get_user_order_item = await order_item_repo.get_by_attr(
         attr=dict(tracking_id=data_in.item_tracking_id),
         first=True,
-        load_related=True,
+        loads=("product", "order"),
     )
     if get_user_order_item is None:
         raise error.NotFoundError("product is not found in your order")
@@ -157,7 +157,9 @@ async def get_order(
     order_id: str,
 ) -> model.Order:
     order = await order_repo.get_by_attr(
-        attr=dict(order_id=order_id, user=user), load_related=True, first=True
+        attr=dict(order_id=order_id, user=user),
+        first=True,
+        loads=("user", "shipping_address", "status", "items"),
     )
     if order:
         return order
@@ -169,7 +171,7 @@ async def get_order_items(
     order_id: str,
 ) -> model.Order:
     order = await order_repo.get_by_attr(
-        attr=dict(order_id=order_id, user=user), first=True, load_related=True
+        attr=dict(order_id=order_id, user=user), first=True, loads=("items",)
     )
     if order:
         return order.items
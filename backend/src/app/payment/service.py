@@ -20,7 +20,9 @@ async def create_payment(
     user: User,
 ) -> Response:
     get_order = await order_repo.get_by_attr(
-        attr=dict(order_id=obj.order_id, user_id=user.id), first=True, load_related=True
+        attr=dict(order_id=obj.order_id, user_id=user.id),
+        first=True,
+        loads=("items.product.property",),
     )
 
     if not get_order:
@@ -58,7 +60,7 @@ async def create_payment(
 
 async def get_payment(payment_id: uuid.UUID, user: User) -> model.Payment:
     get_payment = await payment_repo.get_by_attr(
-        attr=dict(id=payment_id), load_related=True
+        attr=dict(id=payment_id), loads=("order",)
     )
     if get_payment and get_payment.order.user_id != user.id:
         raise error.NotFoundError("Payment not found")
@@ -129,7 +131,7 @@ async def verify_user_payment(
     if get_payment.completed:
         raise error.BadDataError("Invalid payment details was provided")
     try:
-        check_payment: schema.IPaymentVerifyOut = payments.verify_payment(
+        check_payment: schema.IPaymentVerifyOut = await payments.verify_payment(
             tx_ref=data_in.reference
         )
         if check_payment.error:
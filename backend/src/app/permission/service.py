@@ -69,7 +69,7 @@ async def update(
         raise error.DuplicateError("Permission already exists")
     if await permission_repo.get_by_attr(attr={"name": data_in.name}):
         raise error.DuplicateError(f"Permission with name `{data_in.name}` already exists")
-    return await permission_repo.update(str(permission_id), data_in.dict())
+    return await permission_repo.update(permission_id, data_in.dict())
 
 
 # delete permission
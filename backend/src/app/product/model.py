@@ -67,7 +67,7 @@ class Product(Base):
     id = sa.Column(
         GUID(),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        default=uuid.uuid4,
     )
     name = sa.Column(sa.String(50))
     description = sa.Column(sa.Text)
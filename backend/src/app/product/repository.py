@@ -66,7 +66,7 @@ class ProductMediaRepository(BaseRepository[model.ProductMedia]):
             self.db.add(check_media)
             await self.db.commit()
             await self.db.refresh(check_media)
-            self.db.expunge_all()
+            self._detach(check_media)
             return check_media
         new_product_media = dict()
         if gallery:
@@ -79,7 +79,7 @@ class ProductMediaRepository(BaseRepository[model.ProductMedia]):
             new_data = self.model(**new_product_media)
             self.db.add(new_data)
             await self.db.commit()
-            self.db.expunge_all()
+            self._detach(new_data)
             return new_data
         return None
 
@@ -150,7 +150,7 @@ class ProductRepository(BaseRepository[model.Product]):
         new_product = self.model(**to_create)
         self.db.add(new_product)
         await self.db.commit()
-        self.db.expunge_all()
+        self._detach(new_product)
         return new_product
 
     async def delete(self, product_id: UUID):
@@ -182,7 +182,7 @@ class ProductRepository(BaseRepository[model.Product]):
         self.db.add(product)
         await self.db.commit()
         await self.db.refresh(product)
-        self.db.expunge_all()
+        self._detach(product)
         return product
 
 
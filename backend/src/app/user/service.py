@@ -218,7 +218,7 @@ async def get_user_review(
     per_page: int = 10,
     page: int = 0,
     sort_by: SortOrder = SortOrder.asc,
-) -> t.Tuple[t.List[Review], int]:
+) -> t.List[Review]:
     user_reviews = await review_repo.filter(
         strict_search=dict(user_id=user_id),
         per_page=per_page,
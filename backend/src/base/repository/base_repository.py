@@ -1,27 +1,152 @@
 import datetime
+import functools
 import typing as t
 from uuid import UUID
 import sqlalchemy as sa
 from pydantic import BaseModel
 from fastapi import HTTPException
 from db.model import Base
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.config import async_session
 from src.base.enum.sort_type import SortOrder
 from src.lib.utils.random_string import random_str
 
 ModelType = t.TypeVar("ModelType", bound=Base)
 
+# upper bound of ids per `IN (...)` list, larger lists push postgres off the
+# primary key index
+_IDS_CHUNK_SIZE = 500
+
+# columns holding credentials are never matched by filter()'s text search
+_SECRET_COLUMNS = frozenset({"password", "access_token", "refresh_token"})
+
+# query-string values for get_by_props, parsed according to the column type
+_PROP_CONVERTERS: t.Dict[t.Type[sa.types.TypeEngine], t.Callable[[str], t.Any]] = {
+    sa.types.DateTime: datetime.datetime.fromisoformat,
+    sa.types.Date: lambda v: datetime.datetime.strptime(v, "%Y-%m-%d").date(),
+    sa.types.Time: lambda v: datetime.datetime.strptime(v, "%H:%M:%S").time(),
+    sa.types.Boolean: lambda v: v.lower() == "true",
+}
+
 
 class BaseRepository(t.Generic[ModelType]):
     def __init__(self, model: t.Type[ModelType]):
         self.model = model
-        self.db = async_session()
+        self._db: t.Optional[AsyncSession] = None
+
+    @property
+    def db(self) -> AsyncSession:
+        return self._open_session()
+
+    def _open_session(self) -> AsyncSession:
+        # the session is only opened once a query actually needs it
+        if self._db is None:
+            self._db = async_session()
+        return self._db
 
     async def __aenter__(self):
+        self._open_session()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.db.close()
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _text_columns(model: t.Type[ModelType]) -> t.List[sa.Column]:
+        return [
+            column
+            for column in model.__table__.c
+            if isinstance(column.type, sa.String)
+            and not isinstance(column.type, sa.Enum)
+            and column.key not in _SECRET_COLUMNS
+        ]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _columns(model: t.Type[ModelType]) -> sa.sql.ColumnCollection:
+        return model.__table__.c
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _attr_names(model: t.Type[ModelType]) -> t.FrozenSet[str]:
+        return frozenset(sa.inspect(model).attrs.keys())
+
+    def _attr_filters(self, attr: dict) -> t.List[sa.sql.ColumnElement]:
+        # plain columns are read straight off the table; relationship keys such
+        # as user=<User> still go through the mapped attribute comparator
+        columns = self._columns(self.model)
+        attr_names = self._attr_names(self.model)
+        return [
+            columns[key] == value if key in columns else getattr(self.model, key) == value
+            for key, value in attr.items()
+            if key in attr_names
+        ]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _prop_converter(
+        model: t.Type[ModelType], prop_name: str
+    ) -> t.Optional[t.Callable[[str], t.Any]]:
+        prop_type = getattr(model, prop_name).type
+        if isinstance(prop_type, (sa.types.Integer, sa.types.Enum)):
+            return prop_type.python_type
+        return next(
+            (conv for type_, conv in _PROP_CONVERTERS.items() if isinstance(prop_type, type_)),
+            None,
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _relationship_names(model: t.Type[ModelType]) -> t.Tuple[str, ...]:
+        return tuple(rel.key for rel in sa.inspect(model).relationships)
+
+    @classmethod
+    def _loader_opts(
+        cls,
+        model: t.Type[ModelType],
+        loads: t.Sequence[str] = (),
+        load_related: bool = False,
+    ) -> t.List[sa.orm.Load]:
+        # explicit relationship paths win, e.g. ("items.product.property",);
+        # load_related alone falls back to every direct relationship of the model
+        if not loads and load_related:
+            loads = cls._relationship_names(model)
+        return [cls._loader_opt(model, path) for path in loads]
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _loader_opt(model: t.Type[ModelType], path: str) -> sa.orm.Load:
+        option, current = None, model
+        for name in path.split("."):
+            attr = getattr(current, name)
+            option = sa.orm.selectinload(attr) if option is None else option.selectinload(attr)
+            current = attr.property.mapper.class_
+        return option
+
+    def _detach(self, *objs: t.Any) -> None:
+        # detach the returned instances together with everything eager-loaded
+        # into their relationships, so no part of the graph stays bound to this
+        # long-lived session; unloaded relationships are skipped, not loaded
+        pending = list(objs)
+        seen: t.Set[int] = set()
+        while pending:
+            obj = pending.pop()
+            state = sa.inspect(obj, raiseerr=False)
+            if not isinstance(state, sa.orm.InstanceState) or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            for rel in state.mapper.relationships:
+                if rel.key in state.unloaded:
+                    continue
+                value = state.dict.get(rel.key)
+                if value is None:
+                    continue
+                pending.extend(value if rel.uselist else [value])
+            if obj in self.db:
+                self.db.expunge(obj)
 
     def make_slug(self, name: str, random_length: int = 10) -> str:
         slug = f"{name.replace(' ', '-').replace('_', '-')[:30]}-{random_str(random_length).strip().lower()}"
@@ -33,36 +158,30 @@ class BaseRepository(t.Generic[ModelType]):
         return select
 
     async def get(
-        self, id: UUID, load_related: bool = False, expunge: bool = True
+        self,
+        id: UUID,
+        load_related: bool = False,
+        expunge: bool = True,
+        loads: t.Sequence[str] = (),
     ) -> t.Optional[ModelType]:
-        stmt = None
-        if load_related:
-            stmt = (
-                sa.select(self.model)
-                .options(sa.orm.selectinload("*"))
-                .where(self.model.id == str(id))
-            )
-            result = await self.db.execute(stmt)
-            if result:
-                if expunge:
-                    self.db.expunge_all()
-                return result.scalar()
-            return None
-        else:
-            stmt = sa.select(self.model).where(self.model.id == str(id))
-            result = await self.db.execute(stmt)
-            if result is None:
-                return None
-            if expunge:
-                self.db.expunge_all()
-            return result.scalars().first()
+        stmt = (
+            sa.select(self.model)
+            .options(*self._loader_opts(self.model, loads, load_related))
+            .where(self.model.id == id)
+        )
+        result = await self.db.execute(stmt)
+        obj = result.scalars().first()
+        if expunge:
+            self._detach(obj)
+        return obj
 
     async def get_by_id(self, id: UUID, expunge: bool = True) -> ModelType:
         stm = sa.select(self.model).where(self.model.id == id)
         get_cat = await self.db.execute(stm)
+        obj = get_cat.scalar()
         if expunge:
-            self.db.expunge_all()
-        return get_cat.scalar()
+            self._detach(obj)
+        return obj
 
     async def get_by_props(
         self,
@@ -70,69 +189,73 @@ class BaseRepository(t.Generic[ModelType]):
         prop_values: t.List[str],
         load_related: bool = False,
         expunge: bool = True,
+        loads: t.Sequence[str] = (),
     ) -> t.List[ModelType]:
         prop_column = getattr(self.model, prop_name)
-        if isinstance(prop_column.type, (sa.types.Integer, sa.types.Enum)):
-            prop_values = [prop_column.type.python_type(v) for v in prop_values]
-        elif isinstance(prop_column.type, sa.types.DateTime):
-            prop_values = [datetime.datetime.fromisoformat(v) for v in prop_values]
-        elif isinstance(prop_column.type, sa.types.Date):
-            prop_values = [datetime.datetime.strptime(v, "%Y-%m-%d").date() for v in prop_values]
-        elif isinstance(prop_column.type, sa.types.Time):
-            prop_values = [datetime.datetime.strptime(v, "%H:%M:%S").time() for v in prop_values]
-        elif isinstance(prop_column.type, sa.types.Boolean):
-            prop_values = [True if v.lower() == "true" else False for v in prop_values]
-        elif isinstance(prop_column.type, sa.types.UUID):
-            prop_values = [UUID(v) for v in prop_values]
-        stm = sa.select(self.model)
-        if load_related:
-            stm = stm.options(sa.orm.selectinload("*"))
-        stm = sa.select(self.model).where(prop_column.in_(prop_values))
+        converter = self._prop_converter(self.model, prop_name)
+        if converter is not None:
+            prop_values = [converter(v) for v in prop_values]
+        stm = (
+            sa.select(self.model)
+            .options(*self._loader_opts(self.model, loads, load_related))
+            .where(prop_column.in_(prop_values))
+        )
         get_cats = await self.db.execute(stm)
+        objs = get_cats.scalars().all()
         if expunge:
-            self.db.expunge_all()
-        return get_cats.scalars().all()
+            self._detach(*objs)
+        return objs
 
     async def get_by_ids(
         self,
         ids: t.List[UUID],
         load_related: bool = False,
         expunge: bool = True,
+        loads: t.Sequence[str] = (),
     ) -> t.List[ModelType]:
-        query = sa.select(self.model)
-        if load_related:
-            query = query.options(sa.orm.selectinload("*"))
-        query = query.where(self.model.id.in_([str(id) for id in ids]))
-        results = await self.db.execute(query)
+        query = sa.select(self.model).options(
+            *self._loader_opts(self.model, loads, load_related)
+        )
+        # repeated ids could land in different chunks and return a row twice;
+        # compare them as UUIDs so an id and its string form count as one
+        ids = list(dict.fromkeys(id if isinstance(id, UUID) else UUID(str(id)) for id in ids))
+        objs: t.List[ModelType] = []
+        # an AsyncSession runs one statement at a time, so the chunks are
+        # fetched in sequence rather than gathered
+        for start in range(0, len(ids), _IDS_CHUNK_SIZE):
+            results = await self.db.execute(
+                query.where(self.model.id.in_(ids[start:start + _IDS_CHUNK_SIZE]))
+            )
+            objs.extend(results.scalars().all())
         if expunge:
-            self.db.expunge_all()
-        return results.scalars().all()
+            self._detach(*objs)
+        return objs
 
     async def update(
         self, id: UUID, obj: t.Union[dict, BaseModel], expunge: bool = True
     ) -> t.Optional[ModelType]:
         stmt = (
             sa.update(self.model)
-            .where(self.model.id == str(id))
+            .where(self.model.id == id)
             .values(obj.dict() if isinstance(obj, BaseModel) else obj)
             .returning(self.model)
         )
         result = await self.db.execute(stmt)
         await self.db.commit()
+        obj = result.scalar_one_or_none()
         if expunge:
-            self.db.expunge_all()
-        return result.scalar_one_or_none()
+            self._detach(obj)
+        return obj
 
     async def delete(self, id: UUID, expunge: bool = True) -> t.Optional[ModelType]:
-        result = await self.db.execute(sa.select(self.model).where(self.model.id == str(id)))
-        row = result.fetchone()
+        stmt = sa.delete(self.model).where(self.model.id == id).returning(self.model)
+        result = await self.db.execute(stmt)
+        await self.db.commit()
+        row = result.scalar_one_or_none()
         if row is None:
             raise HTTPException(status_code=404, detail="Object not found")
-        stmt = sa.delete(self.model).where(self.model.id == str(id))
-        await self.db.execute(stmt)
-        await self.db.commit()
         if expunge:
-            self.db.expunge_all()
+            self._detach(row)
         return row
 
     async def delete_many(self, ids: t.List[UUID], expunge: bool = True) -> int:
@@ -141,15 +264,11 @@ class BaseRepository(t.Generic[ModelType]):
         stmt = sa.delete(self.model).where(self.model.id.in_(ids))
         result = await self.db.execute(stmt)
         await self.db.commit()
-        if expunge:
-            self.db.expunge_all()
         return result.rowcount
 
     async def get_count(self, expunge: bool = True) -> t.Optional[int]:
         stm = sa.select(sa.func.count(self.model.id))
         result = await self.db.execute(stm)
-        if expunge:
-            self.db.expunge_all()
         count = result.scalar()
         return count if count is not None else None
 
@@ -161,14 +280,15 @@ class BaseRepository(t.Generic[ModelType]):
             to_create = obj
         if not to_create:
             raise ValueError("Cannot create empty object")
-        to_create_filtered = {k: v for k, v in to_create.items() if hasattr(self.model, k)}
+        attr_names = self._attr_names(self.model)
+        to_create_filtered = {k: v for k, v in to_create.items() if k in attr_names}
         try:
             result = self.model(**to_create_filtered)
             self.db.add(result)
             await self.db.commit()
             await self.db.refresh(result)
             if expunge:
-                self.db.expunge_all()
+                self._detach(result)
             return result
         except sa.exc.IntegrityError as e:
             await self.db.rollback()
@@ -181,28 +301,26 @@ class BaseRepository(t.Generic[ModelType]):
         self, objs: t.List[t.Union[dict, BaseModel]], expunge: bool = True
     ) -> t.List[ModelType]:
         to_create_list: t.List[self.model] = []
+        attr_names = self._attr_names(self.model)
 
         for obj in objs:
             if isinstance(obj, BaseModel):
-                new_obj = obj.dict(exclude_unset=True)
-                filtered_obj = {
-                    key: value for key, value in new_obj.items() if hasattr(self.model, key)
-                }
-                to_create_list.append(filtered_obj)
-
+                obj = obj.dict(exclude_unset=True)
             if isinstance(obj, dict):
-                filtered_obj = {
-                    key: value for key, value in obj.items() if hasattr(self.model, key)
-                }
-                to_create_list.append(filtered_obj)
+                to_create_list.append(
+                    {key: value for key, value in obj.items() if key in attr_names}
+                )
 
         try:
-            stmt = sa.insert(self.model).values(to_create_list)
-            result = await self.db.execute(stmt)
+            # executemany form lets SQLAlchemy batch the rows into multi-row
+            # INSERT ... RETURNING statements (see insertmanyvalues_page_size)
+            stmt = sa.insert(self.model).returning(self.model)
+            result = await self.db.scalars(stmt, to_create_list)
+            created = result.all()
             await self.db.commit()
             if expunge:
-                self.db.expunge_all()
-            return result
+                self._detach(*created)
+            return created
         except sa.exc.IntegrityError as e:
             await self.db.rollback()
             if "duplicate key" in str(e):
@@ -216,28 +334,27 @@ class BaseRepository(t.Generic[ModelType]):
         first: bool = False,
         load_related: bool = False,
         expunge: bool = True,
+        loads: t.Sequence[str] = (),
     ) -> t.Union[ModelType, t.List[ModelType]]:
         if isinstance(attr, dict):
-            # create a new dictionary with only the keys that exist in the model
-            valid_keys = [key for key in attr.keys() if hasattr(self.model, key)]
-            attr_filtered = {key: attr[key] for key in valid_keys}
+            filters = self._attr_filters(attr)
 
-            filters = [getattr(self.model, key) == value for key, value in attr_filtered.items()]
-
-            stmt = None
-            if load_related:
-                stmt = (
-                    sa.select(self.model).options(sa.orm.selectinload("*")).where(sa.and_(*filters))
-                )
-            else:
-                stmt = sa.select(self.model).where(sa.and_(*filters))
+            stmt = (
+                sa.select(self.model)
+                .options(*self._loader_opts(self.model, loads, load_related))
+                .where(sa.and_(*filters))
+            )
 
             results = await self.db.execute(stmt)
-            if expunge:
-                self.db.expunge_all()
             if first:
-                return results.scalar()
-            return results.scalars().all()
+                obj = results.scalars().first()
+                if expunge:
+                    self._detach(obj)
+                return obj
+            objs = results.scalars().all()
+            if expunge:
+                self._detach(*objs)
+            return objs
         raise Exception(f"dictionary is expected, but {type(attr)} is passed")
 
     async def filter(
@@ -251,44 +368,37 @@ class BaseRepository(t.Generic[ModelType]):
         strict_search: dict = None,
         load_related: bool = False,
         expunge: bool = True,
-    ) -> t.Tuple[t.List[ModelType], int]:
+        loads: t.Sequence[str] = (),
+        with_total: bool = False,
+    ) -> t.Union[t.List[ModelType], t.Tuple[t.List[ModelType], int]]:
         select_obj = sa.select(self.model)
         if select_columns:
             select_columns = self.make_select_from_str(select=select_columns)
         if select_columns:
-            relationships = sa.inspect(self.model).relationships
-            relationship_names = [rel.key for rel in relationships]
+            relationship_names = self._relationship_names(self.model)
             for column in select_columns:
                 if column in relationship_names:
                     select_columns.pop(select_columns.index(column))
-        if load_related:
-            select_obj = select_obj.options(sa.orm.selectinload("*"))
+        # selectinload keeps LIMIT/OFFSET on the parent rows; a joinedload
+        # would multiply them per related row
+        select_obj = select_obj.options(*self._loader_opts(self.model, loads, load_related))
 
         if strict_search:
-            condition_list = []
-            for key, val in strict_search.items():
-                if hasattr(self.model, key) and val is not None:
-                    condition_list.append(sa.and_(getattr(self.model, key) == val))
             select_obj = select_obj.where(
                 sa.and_(
-                    *[
-                        getattr(self.model, key) == value
-                        for key, value in strict_search.items()
-                        if value is not None and hasattr(self.model, key)
-                    ],
+                    *self._attr_filters(
+                        {key: value for key, value in strict_search.items() if value is not None}
+                    )
                 )
             )
 
-        filter_condition = None
         if filter_string:
-            for column in self.model.__table__.c:
-                if str(column.type).startswith("VARCHAR"):
-                    if filter_condition is None:
-                        filter_condition = column.ilike(f"%{filter_string}%")
-                    else:
-                        filter_condition = filter_condition | column.ilike(f"%{filter_string}%")
-            if filter_condition is not None:
-                select_obj = select_obj.where(filter_condition)
+            text_columns = self._text_columns(self.model)
+            if text_columns:
+                pattern = f"%{filter_string}%"
+                select_obj = select_obj.where(
+                    sa.or_(*[column.ilike(pattern) for column in text_columns])
+                )
 
         if select_columns:
             select_list = [
@@ -308,7 +418,15 @@ class BaseRepository(t.Generic[ModelType]):
                 elif hasattr(self.model, column) and sort_by == SortOrder.asc:
                     select_obj = select_obj.order_by(getattr(self.model, column))
 
-        results = await self.db.execute(select_obj.limit(per_page).offset((page - 1) * per_page))
+        page_stmt = select_obj.limit(per_page).offset((page - 1) * per_page)
+        results = await self.db.execute(page_stmt)
+        rows = results.mappings().all()
         if expunge:
-            self.db.expunge_all()
-        return [row._asdict() for row in results]
+            self._detach(*[value for row in rows for value in row.values()])
+        if not with_total:
+            return rows
+        # the COUNT only runs for callers that ask for it; an AsyncSession
+        # cannot run statements concurrently, so it follows the page query
+        count_stmt = sa.select(sa.func.count()).select_from(select_obj.order_by(None).subquery())
+        total = await self.db.execute(count_stmt)
+        return rows, total.scalar_one()
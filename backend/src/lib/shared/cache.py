@@ -0,0 +1,75 @@
+import functools
+import typing as t
+import orjson
+import redis.asyncio as redis
+from fastapi.encoders import jsonable_encoder
+from db.model import Base
+from core.settings import config
+
+# caching is switched off when no redis url is configured
+redis_client: t.Optional[redis.Redis] = (
+    redis.from_url(config.redis_url) if config.redis_url else None
+)
+
+
+def _encode_model(obj: Base) -> dict:
+    # custom encoders are not recursed into, so encode the column values here
+    # to get the same plain JSON types a cache hit returns
+    return jsonable_encoder({column.key: getattr(obj, column.key) for column in obj.__table__.c})
+
+
+def _encode(result: t.Any) -> t.Any:
+    return jsonable_encoder(result, custom_encoder={Base: _encode_model})
+
+
+def cached(
+    key: t.Callable[..., t.Tuple[str, str]],
+    ttl: int = 300,
+):
+    """Cache the JSON-encoded result of an async service function in redis.
+
+    ``key`` is called with the function's arguments and returns a
+    ``(namespace, field)`` pair; every result in a namespace is stored in one
+    redis hash so that ``invalidate(namespace)`` drops them all at once. The
+    result is always returned JSON-encoded, whether it came from redis or not.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if redis_client is None:
+                return _encode(await func(*args, **kwargs))
+            namespace, field = key(*args, **kwargs)
+            try:
+                hit = await redis_client.hget(namespace, field)
+            except redis.RedisError:
+                hit = None
+            if hit is not None:
+                return orjson.loads(hit)
+            result = _encode(await func(*args, **kwargs))
+            try:
+                async with redis_client.pipeline(transaction=True) as pipe:
+                    await pipe.hset(namespace, field, orjson.dumps(result))
+                    await pipe.expire(namespace, ttl)
+                    await pipe.execute()
+            except redis.RedisError:
+                pass
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+async def invalidate(*namespaces: str) -> None:
+    if redis_client is None or not namespaces:
+        return
+    try:
+        await redis_client.delete(*namespaces)
+    except redis.RedisError:
+        pass
+
+
+async def close() -> None:
+    if redis_client is not None:
+        await redis_client.close()
@@ -1,7 +1,10 @@
+import asyncio
+import functools
 import typing as t
 from src.app.order.model import OrderItem
 from src.app.payment import schema
 import httpx
+import orjson
 from rave_python import Rave
 from core.settings import config
 import warnings
@@ -16,44 +19,69 @@ rave = Rave(
     production=True,
 )
 
-payment_init_url: str = "https://api.flutterwave.com/v3/payments"
+flutterwave_base_url: str = "https://api.flutterwave.com/v3"
+
+# shared across requests so the TLS connection to flutterwave is kept alive;
+# closed by the application's shutdown handler
+flutterwave_client = httpx.AsyncClient(
+    base_url=flutterwave_base_url,
+    headers={
+        "Authorization": f"Bearer {config.payment_secret_key}",
+        "Content-Type": "application/json",
+    },
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
 
 
 async def generate_link(
     data_in: schema.IPaymentLinkData,
 ) -> schema.IPaymentResponse:
-    async with httpx.AsyncClient(
-        headers={"Authorization": f"Bearer {config.payment_secret_key}"}
-    ) as client:
-        response = await client.post(
-            url=f"{payment_init_url}",
-            json=data_in.dict(),
-        )
+    response = await flutterwave_client.post(
+        "/payments",
+        content=orjson.dumps(data_in.dict(), default=float),
+    )
     return schema.IPaymentResponse(**response.json())
 
 
-def verify_payment(tx_ref: str) -> schema.IPaymentVerifyOut:
-    response: schema.IPaymentVerifyOut = rave.Card.verify(tx_ref)
+async def verify_payment(tx_ref: str) -> schema.IPaymentVerifyOut:
+    # rave-python verifies over blocking requests, keep it off the event loop
+    response: schema.IPaymentVerifyOut = await asyncio.to_thread(rave.Card.verify, tx_ref)
     return schema.IPaymentVerifyOut(**response)
 
 
+@functools.lru_cache(maxsize=4096)
+def _line_total(
+    pdf_price,
+    hard_back_price,
+    paper_back_price,
+    discount: float,
+    pdf: bool,
+    hard_back_qty: int,
+    paper_back_qty: int,
+):
+    line_total = hard_back_qty * calculate_discount(
+        hard_back_price, discount
+    ) + paper_back_qty * calculate_discount(paper_back_price, discount)
+    if pdf:
+        line_total += calculate_discount(pdf_price, discount)
+    return line_total
+
+
 def get_product_total_price(
     items: t.List[OrderItem],
 ) -> float:
-    if items:
-        pdf_price = 0
-        hard_back_price = 0
-        paper_back_price = 0
-        for item in items:
-            if item.pdf:
-                pdf_price += calculate_discount(
-                    item.product.property.pdf_price, item.product.property.discount
-                )
-            hard_back_price += item.hard_back_qty * calculate_discount(
-                item.product.property.hard_back_price, item.product.property.discount
-            )
-            paper_back_price += item.paper_back_qty * calculate_discount(
-                item.product.property.paper_back_price, item.product.property.discount
-            )
-        total_price = pdf_price + hard_back_price + paper_back_price
-        return total_price
+    if not items:
+        return 0.0
+    return sum(
+        _line_total(
+            item.product.property.pdf_price,
+            item.product.property.hard_back_price,
+            item.product.property.paper_back_price,
+            item.product.property.discount,
+            item.pdf,
+            item.hard_back_qty,
+            item.paper_back_qty,
+        )
+        for item in items
+    )
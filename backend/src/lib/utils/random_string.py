@@ -1,10 +1,12 @@
-import random
-import string
+import base64
+import os
 import uuid
 
 
 def random_str(size=7) -> str:
-    ran = "".join(random.choices(string.ascii_uppercase + uuid.uuid4().hex.upper(), k=size))
+    # base32 yields 5 bits per character, so read just enough bytes from the
+    # OS and trim; the result only ever contains A-Z and 2-7
+    ran = base64.b32encode(os.urandom(-(-size * 5 // 8)))[:size].decode("ascii")
     return ran
 
 
@@ -13,4 +15,4 @@ def generate_orderId(size: int) -> str:
 
 
 def generate_uuid(make_string: bool = False):
-    return uuid.uuid4 if not make_string else uuid.uuid4().hex
+    return uuid.uuid4() if not make_string else uuid.uuid4().hex